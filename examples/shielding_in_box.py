@@ -1,4 +1,5 @@
-import os
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
@@ -6,7 +7,7 @@ import ema
 
 
 # User settings
-basepath = 'shielding_in_box/1'
+basepath = Path('shielding_in_box/1')
 probe1_name = 'long_box_probe.dat'
 probe2_name = 'short_box_probe.dat'
 ref_name = 'Plane_Wave.dat'
@@ -14,14 +15,14 @@ se_name = 'se_stats.dat'
 
 
 # Construct paths
-probe1_path = os.path.join(basepath, probe1_name)
-probe2_path = os.path.join(basepath, probe2_name)
-ref_path = os.path.join(basepath, ref_name)
-se_path = os.path.join(basepath, se_name)
+probe1_path = basepath / probe1_name
+probe2_path = basepath / probe2_name
+ref_path = basepath / ref_name
+se_path = basepath / se_name
 
 
 # Calculate shielding if se_stats.dat does not yet exist
-if not os.path.exists(se_path):
+if not se_path.exists():
 	# Load electric field data from two box probes
 	t, e = ema.load_box_probes(probe1_path, probe2_path)
 
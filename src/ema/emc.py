@@ -2,14 +2,14 @@ import warnings
 import os
 import numpy as np
 
-from .signal import rfft
+from .signal import _rfft
 from .results import load_probe
 
 
 def shielding(xf, xf_ref, axis=-1):
     """Calculates shielding effectiveness in decibels from frequency domain data.
     
-    Default settings require x to have time along the first axis.
+    Default settings require xf to have frequency along the last axis.
     Multiple data sets can be processed simultaneously by stacking along additional axes.
     
     Parameters
@@ -34,13 +34,31 @@ def shielding(xf, xf_ref, axis=-1):
     elif xf.shape[axis] != xf_ref.size:
         raise ValueError(f'xf dimension {axis} ({xf.shape[axis]}) must match size of xref ({xf_ref.size}).')
         
-    # Compute shielding in dB
-    se = 20 * np.log10(np.abs(np.swapaxes(xf_ref / np.swapaxes(xf, -1, axis), -1, axis)))
+    # Work in floating point so the in-place steps below accept integer input
+    xf = np.asarray(xf, dtype=np.result_type(xf, np.float32))
+    xf_ref = np.asarray(xf_ref, dtype=np.result_type(xf_ref, np.float32))
+
+    # Compute shielding in dB from squared magnitudes, avoiding complex division and square roots
+    ref_power = xf_ref.real ** 2 + xf_ref.imag ** 2
+
+    # Shape reference to broadcast along the shielding axis of xf (already aligned for last axis)
+    if axis not in (-1, xf.ndim - 1):
+        shape = [1] * xf.ndim
+        shape[axis] = xf_ref.size
+        ref_power = ref_power.reshape(shape)
+
+    se = np.square(xf.real)
+    se += np.square(xf.imag)
+
+    # Remaining steps operate in place on a single buffer
+    np.divide(ref_power, se, out=se)
+    np.log10(se, out=se)
+    se *= 10
     
     return se
 
 
-def shielding_from_timeseries(t, x, x_ref):
+def shielding_from_timeseries(t, x, x_ref, precision=None):
     """Calculates shielding effectiveness from X/Y/Z field probe data.
     
     Array x is expected to have dimensions [..., component, time], with ...
@@ -57,6 +75,8 @@ def shielding_from_timeseries(t, x, x_ref):
         Measurement time series (nd)
     x_ref: np.ndarray
         Reference time series (1d/2d)
+    precision : str (optional)
+        Precision of FFTs ('single' | 'double'); see signal.rfft
 
     Returns
     -------
@@ -77,17 +97,17 @@ def shielding_from_timeseries(t, x, x_ref):
     if x_ref.ndim > 2:
         raise ValueError(f'x_ref cannot have more than two dimensions; {x_ref.ndim} provided.')
 
-    if np.any(np.iscomplex(x)):
+    if np.iscomplexobj(x):
         warnings.warn(f'Array x has complex dtype {x.dtype}; imaginary components will be disregarded, which may affect results.')
     
-    # Compute FFTs
-    f, x_fft = rfft(t, x)
-    _, x_ref_fft = rfft(t, x_ref)
+    # Compute FFTs (amplitude scaling of signal.rfft is skipped since it cancels in the ratio)
+    f, x_fft = _rfft(t, x, precision=precision)
+    _, x_ref_fft = _rfft(t, x_ref, precision=precision)
 
-    # Compute vector magnitudes
-    x_fft = np.sqrt(np.sum(x_fft ** 2, axis=-2))
+    # Compute vector magnitudes (in place, since the FFT arrays are not shared)
+    x_fft = _vector_magnitude(x_fft)
     if x_ref.ndim == 2:
-        x_ref_fft = np.sqrt(np.sum(x_ref_fft ** 2, axis=-2))
+        x_ref_fft = _vector_magnitude(x_ref_fft)
     
     # Compute shielding in dB
     se = shielding(x_fft, x_ref_fft)
@@ -95,6 +115,16 @@ def shielding_from_timeseries(t, x, x_ref):
     return f, se
 
 
+def _vector_magnitude(x_fft):
+    """Combines vector components along axis -2 of x_fft, overwriting x_fft."""
+
+    np.square(x_fft, out=x_fft)
+    x_fft = np.sum(x_fft, axis=-2)
+    np.sqrt(x_fft, out=x_fft)
+
+    return x_fft
+
+
 def shielding_from_file(path, refpath):
     """Calculates shielding effectiveness from field probe result files.
 
@@ -1,7 +1,5 @@
 import warnings
 import os
-import glob
-import time
 
 import numpy as np
 
@@ -56,28 +54,30 @@ class Emin(File):
         if mu_rel is not None:
             mu = mu_rel * 1.25663706e-6
             
+        # Locate property lines of all definitions (assumes properties are four lines below name)
+        indices = self.find_all(f'* MATERIAL : {name}') + 4
+
+        if len(indices) == 0:
+            return
+
+        # Parse properties from the first definition and apply new values
+        sig0, eps0, mu0, sigm0 = np.array(self.get(indices[0]).split(), dtype=np.float64)
+
+        if sig is not None:
+            sig0 = sig
+        if eps is not None:
+            eps0 = eps
+        if mu is not None:
+            mu0 = mu
+        if sigm is not None:
+            sigm0 = sigm
+
+        strings = ['%.10E' % val for val in [sig0, eps0, mu0, sigm0]]
+        text = '    '.join(strings)
+
         # Modify emin lines
-        text = None
-        
-        for index in self.find_all(f'* MATERIAL : {name}'):
-            i = index + 4 #assumes properties are four lines below name
-            
-            if text is None:
-                sig0, eps0, mu0, sigm0 = np.array(self.get(i).split()).astype(np.float64)
-                
-                if sig is not None:
-                    sig0 = sig
-                if eps is not None:
-                    eps0 = eps
-                if mu is not None:
-                    mu0 = mu
-                if sigm is not None:
-                    sigm0 = sigm
-                    
-                strings = ['%.10E' % val for val in [sig0, eps0, mu0, sigm0]]
-                text = '    '.join(strings)       
-            
-            self.replace(i, text)
+        for i in indices:
+            self.lines[i] = text
             
 
     def restrict_surface_current(self, direction):
@@ -112,10 +112,12 @@ class Emin(File):
         i0 = self.find('!CURRENT DENSITY SOURCE') + 4 #assumes 4-line offset to start of point list
         i1 = self.find_next(i0, '', exact=True) - 1 #end before next blank line
 
-        # Only retain lines with non-zero values in the desired column
+        # Only retain lines with non-zero values in the desired column (parsed in a single pass)
         column = column_dict[direction]
 
-        lines_filtered = [line for line in self.lines[i0:i1] if float(line.split()[column]) != 0]
+        lines = self.lines[i0:i1+1]
+        values = np.loadtxt(lines, usecols=column, ndmin=1)
+        lines_filtered = [lines[k] for k in np.flatnonzero(values)]
 
         if len(lines_filtered) == 0:
             warnings.warn(f'No {direction}-directed source elements found; probe definition not changed.')
@@ -151,7 +153,8 @@ class Emin(File):
             path_and_name = path
         
         else:
-            emins = glob.glob('\\'.join([path, '*.emin']))
+            with os.scandir(path) as entries:
+                emins = [entry.path for entry in entries if entry.name.endswith('.emin') and not entry.name.startswith('.') and entry.is_file()]
             
             if len(emins) > 0:
                 path_and_name = emins[0]
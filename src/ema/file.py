@@ -1,14 +1,87 @@
 import warnings
+import itertools
+import collections
 import os
-import time
 import re
 
 import numpy as np
 
 
+# Number of distinct find/find_all results kept per file; the least recently used is dropped first
+_QUERY_CACHE_SIZE = 128
+
+
+def _limit(n_max):
+    """Converts n_max search argument to an islice stop value (no limit unless positive)."""
+
+    return n_max if n_max is not None and n_max > 0 else None
+
+
+class _Lines(list):
+    """List of file lines that counts modifications to its contents.
+
+    File caches data derived from its lines (e.g. the search index) and compares
+    the revision counter to detect edits, including direct edits to File.lines.
+    """
+
+    __slots__ = ('revision',)
+
+    def __init__(self, lines=()):
+        list.__init__(self, lines)
+        self.revision = 0
+
+    def __setitem__(self, key, value):
+        self.revision += 1
+        list.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.revision += 1
+        list.__delitem__(self, key)
+
+    def __iadd__(self, other):
+        self.revision += 1
+        return list.__iadd__(self, other)
+
+    def __imul__(self, n):
+        self.revision += 1
+        return list.__imul__(self, n)
+
+    def append(self, line):
+        self.revision += 1
+        list.append(self, line)
+
+    def extend(self, lines):
+        self.revision += 1
+        list.extend(self, lines)
+
+    def insert(self, i, line):
+        self.revision += 1
+        list.insert(self, i, line)
+
+    def pop(self, i=-1):
+        self.revision += 1
+        return list.pop(self, i)
+
+    def remove(self, line):
+        self.revision += 1
+        list.remove(self, line)
+
+    def clear(self):
+        self.revision += 1
+        list.clear(self)
+
+    def sort(self, **kwargs):
+        self.revision += 1
+        list.sort(self, **kwargs)
+
+    def reverse(self):
+        self.revision += 1
+        list.reverse(self)
+
+
 class File:
     """Parent class for handling .emin, .inp, and .cin files."""
-    
+
     def __init__(self, path, ext=None):
         """Initializes file object from path and filename."""
 
@@ -32,11 +105,173 @@ class File:
         else:
             self.path = path
             
-        # Read contents and strip newline characters
+        # Read contents in one pass (a single read sized to the file) and split into lines without newline characters
         with open(self.path, 'r') as file:
-            self.lines = file.read().splitlines()
-        
-        
+            contents = file.read()
+
+        lines = contents.split('\n')
+
+        if contents.endswith('\n') or contents == '':
+            lines.pop()
+
+        self.lines = lines
+
+
+    @property
+    def lines(self):
+        """List of lines in the file, without newline characters."""
+
+        return self._lines
+
+
+    @lines.setter
+    def lines(self, lines):
+        self._lines = _Lines(lines)
+        self._cache = {}
+        self._queries = collections.OrderedDict()
+        self._cache_revision = 0
+        self._searched_revision = None
+
+
+    def _cached(self, key, build):
+        """Returns the cached result of build(), discarding all cached results if self.lines has changed."""
+
+        self._check_revision()
+
+        if key not in self._cache:
+            self._cache[key] = build()
+
+        return self._cache[key]
+
+
+    def _cached_query(self, key, search):
+        """Returns the cached result of search() for a find/find_all query, keeping only recent queries."""
+
+        self._check_revision()
+
+        if key in self._queries:
+            self._queries.move_to_end(key)
+        else:
+            self._queries[key] = search()
+            if len(self._queries) > _QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+
+        return self._queries[key]
+
+
+    def _check_revision(self):
+        """Discards all cached results if self.lines has changed since they were computed."""
+
+        if self._cache_revision != self._lines.revision:
+            self._cache.clear()
+            self._queries.clear()
+            self._cache_revision = self._lines.revision
+
+
+    def _index_ready(self):
+        """Returns whether a search should use the joined search index.
+
+        Building the index costs a pass over the whole file, so after an edit it is only
+        built by the second search on the unchanged lines. Loops that alternate edits with
+        searches check lines directly instead, which only costs the distance searched.
+        """
+
+        self._check_revision()
+
+        if 'search_index' in self._cache or self._searched_revision == self._lines.revision:
+            return True
+
+        self._searched_revision = self._lines.revision
+        return False
+
+
+    def _search_index(self):
+        """Returns all lines joined into a single string and the offset of each line within it.
+
+        The string starts and ends with a newline and has a newline between lines, so
+        line i occupies blob[offsets[i]:offsets[i+1]-1] and is preceded by a newline.
+        """
+
+        def build():
+            blob = '\n'.join(['', *self._lines, ''])
+            return blob, self._line_offsets(self._lines)
+
+        return self._cached('search_index', build)
+
+
+    @staticmethod
+    def _line_offsets(lines):
+        """Returns the offset of each line within the search index, plus the offset one past the end."""
+
+        # Each line is followed by a newline; accumulate in place to avoid temporary arrays
+        lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+        lengths += 1
+        offsets = np.ones(len(lines) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        offsets[1:] += 1
+
+        return offsets
+
+
+    def _search_index_lower(self):
+        """Returns a lowercase copy of the search index, or None if lowercasing changes its length."""
+
+        def build():
+            blob, offsets = self._search_index()
+            lower = blob.lower()
+
+            # Lowercasing some non-ASCII characters changes their length, which breaks the offsets
+            if len(lower) != len(blob):
+                return None
+
+            return lower, offsets
+
+        return self._cached('search_index_lower', build)
+
+
+    def _find_candidates(self, text, start, end, whole_line=False, case=True):
+        """Yields indices of lines in range(start, end) that may contain text.
+
+        Candidates are located with str.find on the joined search index rather than
+        by looping over lines in Python; callers must still verify each candidate.
+        If whole_line is True, only lines exactly equal to text are yielded.
+        """
+
+        index = self._search_index() if case else self._search_index_lower()
+
+        # Fall back to checking every line if no usable index exists
+        if index is None:
+            yield from range(start, end)
+            return
+
+        blob, offsets = index
+
+        # A whole line is bounded by the newlines on either side
+        if whole_line:
+            needle = '\n' + text + '\n'
+            shift = 1
+        else:
+            needle = text
+            shift = 0
+
+        pos = int(offsets[start]) - shift
+        stop = int(offsets[end])
+
+        while True:
+            hit = blob.find(needle, pos, stop)
+            if hit < 0:
+                return
+
+            i = int(np.searchsorted(offsets, hit + shift, side='right')) - 1
+            if i >= end:
+                return
+
+            yield i
+
+            # Resume at the start of the next line
+            pos = int(offsets[i + 1]) - shift
+
+
     def save(self, path=None):
         """Writes modified lines to file.
 
@@ -55,8 +290,9 @@ class File:
             
         with open(path, 'w') as file:
             # TODO: decide on management of newline characters
-            #file.writelines(self.lines)
-            file.writelines([line + '\n' for line in self.lines])
+            # Write contents in a single call, ending with a newline unless the file is empty
+            if len(self.lines) > 0:
+                file.write('\n'.join(self.lines) + '\n')
             
         
     @staticmethod
@@ -78,22 +314,21 @@ class File:
         if args[0] is None:
             return None
 
-        # Accept either an iterable in the first position or multiple line numbers
-        if np.iterable(args[0]):
-            l = np.array(args[0])
-            
-        else:
-            #TODO: verify if length check is necessary. Will len=1 list unpack?
-            if len(args) > 1:
-                l = np.array(args)
-            else:
-                l = args[0]
-                
+        # Convert a single line number without NumPy overhead
+        if len(args) == 1 and type(args[0]) is int:
+            if args[0] < 1:
+                raise ValueError('Argument l may not be or contain values less than one; line numbers are one-indexed.')
+            return args[0] - 1
+
+        # Accept either an iterable in the first position or multiple line numbers (no copy for arrays)
+        l = np.asarray(args[0] if len(args) == 1 or np.iterable(args[0]) else args)
+
         # Handle errors
-        if np.any(l < 1):
+        if l.size > 0 and l.min() < 1:
             raise ValueError('Argument l may not be or contain values less than one; line numbers are one-indexed.')
-        
-        return l - 1
+
+        # Return a single line number as a scalar
+        return l.item() - 1 if l.ndim == 0 else l - 1
     
     
     @staticmethod
@@ -114,18 +349,16 @@ class File:
         # Return None if first arg is None
         if args[0] is None:
             return None
+
+        # Convert a single index without NumPy overhead
+        if len(args) == 1 and type(args[0]) is int:
+            return args[0] + 1
                 
-        # Accept either an iterable in the first position or multiple indices
-        if np.iterable(args[0]):
-            i = np.array(args[0])
-            
-        else:
-            if len(args) > 1:
-                i = np.array(args)
-            else:
-                i = args[0]
-        
-        return i + 1
+        # Accept either an iterable in the first position or multiple indices (no copy for arrays)
+        i = np.asarray(args[0] if len(args) == 1 or np.iterable(args[0]) else args)
+
+        # Return a single index as a scalar
+        return i.item() + 1 if i.ndim == 0 else i + 1
         
         
     def find_all(self, text, start=0, end=None, exact=False, separator=None, case=True, n_max=None, verbose=False):
@@ -156,31 +389,72 @@ class File:
             Indices of text string in self.lines; empty list if not present.
         """
         
+        # Normalize search arguments
+        text, start, end, separator = self._search_args(text, start, end, separator, case)
+
+        # Search for occurrences of text, reusing the result of an identical earlier search
+        def search():
+            matches = self._matches(text, start, end, exact, separator, case)
+            return np.array(list(itertools.islice(matches, _limit(n_max))))
+
+        key = ('find_all', text, start, end, exact, separator, case, n_max)
+        indices = self._cached_query(key, search)
+
+        if len(indices) == 0 and verbose:
+            print(f'Text string "{text}" not found.')
+
+        # Return a copy so that callers cannot modify the cached result
+        return indices.copy()
+
+
+    def _search_args(self, text, start, end, separator, case):
+        """Normalizes search arguments shared by File.find_all and File.find."""
+
         # Make text lowercase if not case sensitive
         if not case:
             text = text.lower()
 
+        # Resolve start and end arguments into a range of indices
+        start, end, _ = slice(start, end).indices(len(self.lines))
+
+        # Make separator hashable for caching
+        if isinstance(separator, list):
+            separator = tuple(separator)
+
+        return text, start, end, separator
+
+
+    def _matches(self, text, start, end, exact, separator, case):
+        """Yields indices of text in self.lines[start:end] in order; implementation of File.find_all."""
+
+        # Candidates from the search index are already matches unless the text spans lines
+        indexed = self._index_ready()
+        trusted = (not exact or separator is None) and '\n' not in text
+        if indexed and trusted and (case or self._search_index_lower() is not None):
+            candidates = self._find_candidates(text, start, end, exact, case)
+
+            # Whole-line hits must also span the full line (lines may contain newlines if edited)
+            if exact:
+                offsets = self._search_index()[1]
+                candidates = (i for i in candidates if offsets[i + 1] - offsets[i] - 1 == len(text))
+
+            yield from candidates
+            return
+
         # Format separators into regex pattern if needed
         if exact and separator is not None:
             if isinstance(separator, (list, tuple, str)):
                 pattern = '|'.join(separator)
 
-        # Create subset of self.lines bounded by start and end arguments
-        if end is not None:
-            lines = self.lines[start:end]
-        else:
-            lines = self.lines[start:]
-        
-        # Search for occurrences of text up to n_max
-        n_found = 0
-        indices = []
-        
-        for i, line in enumerate(lines):
+        # Check each candidate line for occurrences of text (every line if the index is not built yet)
+        whole_line = exact and separator is None
+        lines = self.lines
+        candidates = self._find_candidates(text, start, end, whole_line, case) if indexed else range(start, end)
+
+        for i in candidates:
             match = False
+            line = lines[i] if case else lines[i].lower()
 
-            if not case:
-                line = line.lower()
-                
             if (exact and text == line) or (not exact and text in line):
                 match = True
 
@@ -197,16 +471,7 @@ class File:
                         print(exc)
 
             if match:
-                indices.append(start + i)
-                n_found += 1
-                
-                if n_found == n_max:
-                    break
-
-        if n_found == 0 and verbose:
-            print(f'Text string "{text}" not found.')
-
-        return np.array(indices)
+                yield i
         
         
     def find(self, text, n=1, **kwargs):
@@ -226,12 +491,29 @@ class File:
             Index of text string in self.lines; None if not present.
         """
         
-        indices = self.find_all(text, n_max=n, **kwargs)
-        
-        if len(indices) > 0:
-            return indices[-1]
-        else:
-            return None
+        return self._find_nth(text, n, **kwargs)
+
+
+    def _find_nth(self, text, n, start=0, end=None, exact=False, separator=None, case=True, verbose=False):
+        """Returns index of nth occurrence of text (or of the last if fewer exist); implementation of File.find."""
+
+        # Normalize search arguments
+        text, start, end, separator = self._search_args(text, start, end, separator, case)
+
+        # Stop searching at the nth occurrence, reusing the result of an identical earlier search
+        def search():
+            index = None
+            for index in itertools.islice(self._matches(text, start, end, exact, separator, case), _limit(n)):
+                pass
+            return index
+
+        key = ('find', text, start, end, exact, separator, case, n)
+        index = self._cached_query(key, search)
+
+        if index is None and verbose:
+            print(f'Text string "{text}" not found.')
+
+        return index
         
 
     def find_next(self, i, text, **kwargs):
@@ -272,18 +554,39 @@ class File:
         # Put single index into list
         if not np.iterable(i):
              i = [i]
+        else:
+            i = list(i)
         
         # make single string into list for convenience
         if isinstance(text, str):
             text = [text]
-        
-        # Insert lines
-        text.reverse()
-        i = sorted(i, reverse=True)
-        
-        for index in i:
-            for line in text:
-                self.lines.insert(index, line)
+        else:
+            text = list(text)
+
+        # Insert at a single position with one splice
+        if len(i) == 1:
+            self.lines[i[0]:i[0]] = text
+
+        # Insert at several positions by rebuilding the lines in one pass
+        elif all(index >= 0 for index in i):
+            # Sort in place; already-sorted indices (e.g. from find_all) take a single linear pass
+            positions = [min(index, len(self.lines)) for index in i]
+            positions.sort()
+
+            pieces = []
+            prev = 0
+            for index in positions:
+                pieces.append(self.lines[prev:index])
+                pieces.append(text)
+                prev = index
+            pieces.append(self.lines[prev:])
+
+            self.lines[:] = itertools.chain.from_iterable(pieces)
+
+        # Negative indices depend on insertion order; insert from the last index as before
+        else:
+            for index in sorted(i, reverse=True):
+                self.lines[index:index] = text
         
     
     def insert_after(self, i, text):
@@ -327,8 +630,7 @@ class File:
 
         # delete range of lines
         else:
-            #self.lines = [line for i, line in enumerate(self.lines) if i not in range(i0, i1+1)]
-            self.lines = self.lines[:i0] + self.lines[i1+1:]  #10x faster than list comprehension
+            del(self.lines[i0:i1+1])  #in place; avoids rebuilding the list from two slices
         
         
     def replace(self, i, text):
@@ -349,33 +651,27 @@ class File:
         # make single string into list for convenience
         if isinstance(text, str):
             text = [text]
-        
+
         # find start/stop indices
         if isinstance(i, (int, np.integer)):
             i0 = i
-            i1 = i0 #+ len(text) - 1
+            i1 = i0
 
         elif np.iterable(i):
             # TODO: warning for len(i) > 2
             i0, i1 = i
 
         else:
-            print('Unrecognized type for index i:', type(i))
-        
-        # handle case where self.lines is too short
-        if i1 > len(self.lines):
-            i1 = len(self.lines)
-            #n_pad = i1 - len(self.lines)
-            #self.lines.extend([''] * n_pad)
-        
-        # replace lines with provided text
-        
-        if i0 == i1:
-            self.remove(i0)
-        else:
-            self.remove(i0, i1)
-            
-        self.insert(i0, text)
+            raise TypeError(f'Index i must be an integer or a (start, end) pair; {type(i)} provided.')
+
+        # count negative indices from the end of the file
+        if i0 < 0:
+            i0 += len(self.lines)
+        if i1 < 0:
+            i1 += len(self.lines)
+
+        # replace lines (endpoint inclusive) with provided text
+        self.lines[i0:i1+1] = text
                 
                 
     def get(self, i0, i1=None):
@@ -399,9 +695,9 @@ class File:
         if np.iterable(i0) and i1 is not None:
             warnings.warn('Argument i0 is iterable; i1 will be ignored.')
         
-        # Print lines
+        # Get lines
         if np.iterable(i0):
-            return [self.lines[i] for i in i0]
+            return list(map(self.lines.__getitem__, i0))
         
         elif i1 is not None:
             return self.lines[i0:i1+1]
@@ -472,19 +768,20 @@ class File:
                     
         # Print lines
         lines = self.getlines(l0, l1)
-        if l1 is None:
-            lines = [lines]
 
-        for i, line in enumerate(lines):
-            if np.iterable(l0):
-                n = l0[i]
-            else:
-                n = l0 + i
-            
-            if numbered:
-                print(n, '\t|', line)
-            else:
-                print(line)
+        if np.iterable(l0):
+            numbers = l0
+        else:
+            if l1 is None:
+                lines = [lines]
+            numbers = range(l0, l0 + len(lines))
+
+        # Format all lines and print with a single call
+        if numbered:
+            lines = [f'{n} \t| {line}' for n, line in zip(numbers, lines)]
+
+        if len(lines) > 0:
+            print('\n'.join(lines))
 
 
     def print(self, i0, i1=None, numbered=True):
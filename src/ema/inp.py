@@ -11,10 +11,10 @@ from .file import File
 # Current/voltage probe format string
 _probe_fmt = """
 !PROBE
-!!TYPE
-NAME.dat  
-START    END    STEP   
-SEGMENT      CONDUCTOR      INDEX  
+!!{type_}
+{name}.dat  
+{start:.10E}    {end:.10E}    {step:.10E}   
+{segment}      {conductor}      {index}  
 """
 
 
@@ -73,6 +73,48 @@ class Inp(File):
         None
         """
 
+        # Insert probe text
+        index_probes = self.find('Section 14: OUTPUT / PROBES') + 2
+        self.insert(index_probes, self._format_probe(probe_type, segment, conductor, index, name, start, end, timestep))
+
+
+    def probe_batch(self, probe_type, probes, start=None, end=None, timestep=None):
+        """Places several voltage or current probes with a single insertion into the inp file.
+
+        Equivalent to calling Inp.probe for each probe in order, but the probe section
+        is only shifted once rather than once per probe.
+
+        Parameters
+        ----------
+        probe_type : str
+            Type of probe ("current" | "voltage")
+        probes : list
+            List of (segment, conductor, index) tuples; see Inp.probe
+        start : float (optional)
+            Measurement start time
+        end : float (optional)
+            Measurement end time
+        timestep : float (optional)
+            Measurement timestep
+
+        Returns
+        -------
+        None
+        """
+
+        # Successive probes are placed ahead of earlier ones, so stack the blocks in reverse
+        lines = []
+        for segment, conductor, index in reversed(probes):
+            lines.extend(self._format_probe(probe_type, segment, conductor, index, None, start, end, timestep))
+
+        if len(lines) > 0:
+            index_probes = self.find('Section 14: OUTPUT / PROBES') + 2
+            self.insert(index_probes, lines)
+
+
+    def _format_probe(self, probe_type, segment, conductor, index, name, start, end, timestep):
+        """Returns the inp lines defining a single probe; see Inp.probe for parameters."""
+
         # Replace whitespace with underscores
         segment = segment.replace(' ', '_')
         conductor = conductor.replace(' ', '_')
@@ -95,19 +137,11 @@ class Inp(File):
         probe_types = {'voltage': 'CABLE VOLTAGE', 'current': 'CABLE CURRENT'}
 
         # Format probe text
-        probe_text = _probe_fmt
-        probe_text = probe_text.replace('TYPE', probe_types[probe_type])
-        probe_text = probe_text.replace('NAME', name)
-        probe_text = probe_text.replace('START', '%.10E' % start)
-        probe_text = probe_text.replace('END', '%.10E' % end)
-        probe_text = probe_text.replace('STEP', '%.10E' % timestep)
-        probe_text = probe_text.replace('SEGMENT', segment)
-        probe_text = probe_text.replace('CONDUCTOR', conductor)
-        probe_text = probe_text.replace('INDEX', str(index))
+        probe_text = _probe_fmt.format_map({'type_': probe_types[probe_type], 'name': name,
+                                            'start': start, 'end': end, 'step': timestep,
+                                            'segment': segment, 'conductor': conductor, 'index': index})
 
-        # Insert probe text
-        index = self.find('Section 14: OUTPUT / PROBES') + 2
-        self.insert(index, probe_text.splitlines())
+        return probe_text.splitlines()
 
 
     def probe_voltage(self, segment, conductor, index, **kwargs):
@@ -182,16 +216,16 @@ class Inp(File):
         if not isinstance(segments, (list, tuple)):
             segments = [segments]
 
-        # Modify terminations
+        # Locate all termination blocks before modifying any lines
         termination_levels = self.find_all('!BOUNDARY CONDITION')
+        block_ends = self._find_block_ends(termination_levels)
 
-        for i0 in termination_levels:
+        # Modify terminations
+        for i0, i1 in zip(termination_levels.tolist(), block_ends):
             if self.get(i0 + 1) != '!!RESISTIVE':
                 print(f'Skipping termination at line {Inp.itol(i0)}; only resistive terminations are currently supported.')
                 continue
 
-            i1 = self.find_next(i0, '', exact=True)
-
             for segment in segments:
                 occurrences = self.find_all(segment, start=i0, end=i1, exact=True, separator=['_', ' '])
                 added = []
@@ -207,6 +241,20 @@ class Inp(File):
                             added.append(entries[1])
 
 
+    def _find_block_ends(self, starts, offset=0):
+        """Returns the index of the first blank line after each start index plus offset.
+
+        All blocks are located with one search so that callers can edit lines afterwards
+        without searching the modified file again. Blocks without a closing blank line
+        end at the end of the file.
+        """
+
+        blanks = np.append(self.find_all('', exact=True), len(self.lines)).astype(np.int64)
+        ends = blanks[np.searchsorted(blanks[:-1], np.asarray(starts, dtype=np.int64) + offset, side='right')]
+
+        return ends.tolist()
+
+
     def set_terminations(self, res_cond=None, res_shield=None):
         """Sets all conductor and shield terminations to the specified values."""
 
@@ -214,22 +262,26 @@ class Inp(File):
         if not isinstance(res_cond, (int, float, types.NoneType)) or not isinstance(res_shield, (int, float, types.NoneType)):
             raise ValueError(f'Conductor and termination resistances must be of type float, int, or None; {type(res_cond)} and {type(res_shield)} provided.')
         
-        # Modify terminations
+        # Locate all termination blocks before modifying any lines
         termination_levels = self.find_all('!BOUNDARY CONDITION')
+        block_ends = self._find_block_ends(termination_levels, offset=2)
 
-        for i0 in termination_levels:
+        # Modify terminations
+        for i0, i3 in zip(termination_levels.tolist(), block_ends):
             if self.get(i0 + 1) != '!!RESISTIVE':
                 print(f'Skipping termination at line {Inp.itol(i0)}; only resistive terminations are currently supported.')
                 continue
 
             i1 = i0 + 2
-            i2 = self.find_next(i1, '', exact=True) - 1
+            i2 = i3 - 1
+
+            for i in range(i1, i2 + 1):
+                line = self.lines[i]
 
-            for i, line in enumerate(self.get(i1, i2)):
                 try:
                     seg, cond, n, res = line.split()
                 except:
-                    print(f'Failed to read line {i+1} of inp file:\t{line}')
+                    print(f'Failed to read line {Inp.itol(i)} of inp file:\t{line}')
                     continue
 
                 if '___S' in cond:
@@ -237,4 +289,4 @@ class Inp(File):
                 else:
                     new_res = str(res_cond) if res_cond is not None else res
 
-                self.lines[i1+i] = '\t'.join([seg, cond, n, new_res])
+                self.lines[i] = '\t'.join([seg, cond, n, new_res])
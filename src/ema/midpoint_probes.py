@@ -1,45 +1,82 @@
 import numpy as np
 
+from .inp import Inp
+
+
+# Mesh offsets of a cell's second node along each cell direction
+_directions = {'X': (1, 0, 0), 'Y': (0, 1, 0), 'Z': (0, 0, 1)}
+
+
+def index_junctions(inp):
+    """Takes in inp file and returns (start, end) index ranges of all junction definitions.
+
+    The result is cached on the inp object until its lines are modified."""
+
+    def build():
+        junctions = []
+        for i0 in inp.find_all('!JUNCTION AND NODE', exact=True):
+            i1 = inp.find_next(i0, '', exact=True)
+            junctions.append((i0, len(inp.lines) if i1 is None else i1))
+        return junctions
+
+    return inp._cached('junctions', build)
+
+
+def find_junction_segments(inp, conductor):
+    """Takes in inp file and conductor name and returns (junction, segments) for each junction,
+    listing the segments connected to the conductor at that junction.
+
+    All junctions are read from a single search for the conductor, and the result is cached
+    on the inp object until its lines are modified."""
+
+    def build():
+        hits = inp.find_all(conductor).astype(np.int64)
+        lines = inp.lines
+        junctions = index_junctions(inp)
+
+        # Attribute each hit to the last junction starting at or before it, if within its range
+        starts = np.array([i0 for i0, _ in junctions], dtype=np.int64)
+        ends = np.array([i1 for _, i1 in junctions], dtype=np.int64)
+        which = np.searchsorted(starts, hits, side='right') - 1
+        inside = which >= 0
+        inside[inside] = hits[inside] < ends[which[inside]]
+
+        segments = [[] for _ in junctions]
+        for j, k in zip(hits[inside].tolist(), which[inside].tolist()):
+            segments[k].append(lines[j].split(None, 1)[0].split('_', 1)[0])
+
+        return [(inp.get(i0 + 1).split('.')[0], tuple(segs)) for (i0, _), segs in zip(junctions, segments)]
+
+    # Return new lists so that callers cannot modify the cached result
+    return [(junction, list(segments)) for junction, segments in inp._cached(('junction_segments', conductor), build)]
+
+
 def create_graph(inp, conductor):
-    """Takes in inp file and conductor name and returns a segment-connections mapping."""
-    
-    graph = {}
+    """Takes in inp file and conductor name and returns a segment-connections mapping.
+
+    Connections of each segment are stored as a frozenset, which removes duplicates and
+    allows set operations against limbs."""
     
-    # Loop through all junctions
-    for i0 in inp.find_all('!JUNCTION AND NODE', exact=True):
-        i1 = inp.find_next(i0, '', exact=True)
-        
-        # Find connecting segments
-        segments = []
-        for j in inp.find_all(conductor, start=i0, end=i1, verbose=False):
-            name = inp.get(j).split()[0].split('_')[0]
-            segments.append(name)
-            
-        # Add neighbors to graph for each segment
-        for seg in segments:
-            other_segs = [s for s in segments if s != seg]
-            if seg in graph:
-                graph[seg] += other_segs
-            else:
-                graph[seg] = other_segs
-                
-    # Remove any duplicate connections from graph
-    for segment, connections in graph.items():
-        graph[segment] = list(set(connections))
-                              
+    graph, _ = build_graph_and_limbs(inp, conductor)
     return graph
 
 
 def find_conductors_and_segments(inp):
     """Takes in inp file and returns dictionary of conductor-segment mappings."""
-    conductors = {}
 
-    i_segments = inp.find_all('!SEGMENT')
-    
-    for i0 in i_segments:
-        conductors = parse_segment(inp, i0, conductors)
-        
-    return conductors
+    def build():
+        conductors = {}
+
+        i_segments = inp.find_all('!SEGMENT')
+
+        for i0 in i_segments:
+            conductors = parse_segment(inp, i0, conductors)
+
+        return conductors
+
+    # Return new lists so that callers cannot modify the cached result
+    conductors = inp._cached('conductors', build)
+    return {name: list(segments) for name, segments in conductors.items()}
 
 
 def parse_segment(inp, i0, conductors):
@@ -61,9 +98,10 @@ def parse_segment(inp, i0, conductors):
 
     segment = segment.split('_')[0] #strip topology information
 
-    # Read conductors and add segment to dictionary
+    # Read conductors and add segment to dictionary (only the first token of each line is needed)
+    lines = inp.lines
     for j in range(i0 + 3, i1):
-        name = inp.get(j).split()[0]
+        name = lines[j].split(None, 1)[0]
         if name in conductors:
             conductors[name].append(segment)
         else:
@@ -85,15 +123,16 @@ def find_limb_containing(segment, limbs):
 def add_limb(new_limb, limbs, verbose=False):
     """Takes in a proposed limb and combines with existing ones if appropriate."""
     i_merge = []
+    new_segments = set(new_limb)
     
-    for segment in new_limb:
-        for i, limb in enumerate(limbs):
-            if segment in limb:
-                i_merge.append(i)
-                if verbose:
-                    print(f'\t\tAdding segment(s) {new_limb} to limb {i}.')
-                #else:
-                #    print(f'\t*** WARNING: found additional candidate limb {i} containing segment {segment} while integrating new limb.')
+    # Find each existing limb sharing a segment with the new limb (once, even if several segments are shared)
+    for i, limb in enumerate(limbs):
+        if not new_segments.isdisjoint(limb):
+            i_merge.append(i)
+            if verbose:
+                print(f'\t\tAdding segment(s) {new_limb} to limb {i}.')
+            #else:
+            #    print(f'\t*** WARNING: found additional candidate limb {i} containing segment {segment} while integrating new limb.')
         
 
     # Create new limb if all segments are new
@@ -122,60 +161,65 @@ def add_limb(new_limb, limbs, verbose=False):
 def create_limbs(inp, conductor, verbose=False):
     """Takes in inp file and conductor name and groups segments into 'limbs'."""
     
+    _, limbs = build_graph_and_limbs(inp, conductor, verbose)
+    return limbs
+
+
+def build_graph_and_limbs(inp, conductor, verbose=False):
+    """Takes in inp file and conductor name and returns the segment-connections mapping
+    (see create_graph) and segment 'limbs' (see create_limbs) from a single pass over
+    the junctions."""
+    
+    graph = {}
     limbs = []
     
-     # Loop through all junctions
-    for i0 in inp.find_all('!JUNCTION AND NODE', exact=True):
-        junction = inp.get(i0 + 1).split('.')[0]
-        i1 = inp.find_next(i0, '', exact=True)
-        
-        # Find connecting segments
-        segments = []
-        for j in inp.find_all(conductor, start=i0, end=i1, verbose=False):
-            name = inp.get(j).split()[0].split('_')[0]
-            segments.append(name)
-            
+    # Loop through all junctions and their connecting segments
+    for junction, segments in find_junction_segments(inp, conductor):
         if len(segments) == 0:
             continue
             
+        # Add neighbors to graph for each segment
+        for seg in segments:
+            graph.setdefault(seg, set()).update(s for s in segments if s != seg)
+
         # Integrate new limbs from segments around junction
-        else:
+        if verbose:
+            print(f'\nSegments connected to Junction {junction}: {segments}.')
+        
+        # 1-2 segments indicates a single limb
+        if len(segments) <= 2:
             if verbose:
-                print(f'\nSegments connected to Junction {junction}: {segments}.')
+                print(f'\tTreating segment(s) {segments} as single limb.')
+            new_limbs = [segments]
             
-            # 1-2 segments indicates a single limb
-            if len(segments) <= 2:
-                if verbose:
-                    print(f'\tTreating segment(s) {segments} as single limb.')
-                new_limbs = [segments]
-                
-            # 3+ segments indicates multiple branching limbs
-            else:
-                if verbose:
-                    print(f'\tTreating segments {segments} as separate limbs.')
-                new_limbs = [[segment] for segment in segments]
-
-            for new_limb in new_limbs:
-                limbs = add_limb(new_limb, limbs, verbose)
-                
+        # 3+ segments indicates multiple branching limbs
+        else:
             if verbose:
-                print(f'\nCurrent limb structure:')
-                for limb in limbs:
-                    print(f'\t{limb}')
+                print(f'\tTreating segments {segments} as separate limbs.')
+            new_limbs = [[segment] for segment in segments]
+
+        for new_limb in new_limbs:
+            limbs = add_limb(new_limb, limbs, verbose)
             
-    return limbs
+        if verbose:
+            print(f'\nCurrent limb structure:')
+            for limb in limbs:
+                print(f'\t{limb}')
+                              
+    graph = {segment: frozenset(connections) for segment, connections in graph.items()}
+    return graph, limbs
 
 
 def find_limb_endpoints(limb, graph, verbose=False):
     """Finds terminating segments for a limb."""
     
     endpoints = []
+    limb_set = set(limb)
     if verbose:
         print('')
     
     for segment in limb:
-        connections = [connection for connection in graph[segment] if connection in limb]
-        if len(connections) == 1:
+        if len(limb_set.intersection(graph[segment])) == 1:
             endpoints.append(segment)
             if verbose:
                 print(f'Identified terminating segment {segment}.')
@@ -201,15 +245,17 @@ def order_limb(limb, graph, verbose=False):
         print(f'\nOrdering limb starting from segment {active}.')
     
     # Find next connected segment not already in ordered limb
+    limb_set = set(limb)
+    ordered_set = {active}
+
     for i in range(len(limb) - 1):
-        connected = graph[active]
-        for segment in connected:
-            if segment in limb and segment not in limb_ordered:
-                if verbose:
-                    print(f'\tConnecting {active} to {segment}.')
-                limb_ordered.append(segment)
-                active = segment
-                break
+        for segment in limb_set.intersection(graph[active]) - ordered_set:
+            if verbose:
+                print(f'\tConnecting {active} to {segment}.')
+            limb_ordered.append(segment)
+            ordered_set.add(segment)
+            active = segment
+            break
                 
     return limb_ordered
 
@@ -224,15 +270,32 @@ def strip_topology(segments):
     return segments
 
 
+def index_segments(emin):
+    """Takes in emin file and returns dictionary mapping MHARNESS segment names to the
+    (start, end) index range of their mesh cells, with the end index exclusive.
+
+    The result is cached on the emin object until its lines are modified."""
+
+    def build():
+        segments = {}
+        for i in emin.find_all('!MHARNESS SEGMENT'):
+            name = emin.get(i + 1).split(None, 1)[0]
+            if name not in segments:
+                i0 = i + 2
+                segments[name] = (i0, emin.find_next(i0, '', exact=True))
+        return segments
+
+    return emin._cached('segments', build)
+
+
 def find_cells_in_segment(segment, emin):
     """Finds the number of cells in a given segment."""
     segment = segment.split('_')[0] #strip topology information
+    segments = index_segments(emin)
     
-    for i in emin.find_all('!MHARNESS SEGMENT'):
-        if emin.get(i + 1).split()[0] == segment:
-            i0 = i + 2
-            i1 = emin.find_next(i0, '', exact=True)
-            return i1 - i0
+    if segment in segments:
+        i0, i1 = segments[segment]
+        return i1 - i0
         
     return None
 
@@ -240,49 +303,68 @@ def find_cells_in_segment(segment, emin):
 def find_array_midpoint(array):
     """Given an array of numbers, finds the index of the entry containing the floored midpoint of the sum."""
     
-    midpoint = sum(array) // 2
-    for i in range(len(array)):
-        if sum(array[:i+1]) >= midpoint:
-            return i
-    
-    return None
+    if len(array) == 0:
+        return None
+
+    # First entry whose running total reaches the midpoint
+    totals = np.cumsum(array)
+    i = int(np.searchsorted(totals, totals[-1] // 2))
+
+    return i if i < len(array) else None
 
 
 def find_terminating_node(x0, y0, z0, dir0, x1, y1, z1, dir1, mode='start'):
     """Identifies terminating node of cell (x0, y0, z0, dir0) based on neighbor."""
 
-    # Find nodes in cells
-    direction = {'X': np.array([1,0,0]), 'Y': np.array([0,1,0]), 'Z': np.array([0,0,1])}
-    n00 = np.array((x0, y0, z0), dtype=np.int32)
-    n01 = n00 + direction[dir0]
-    n10 = np.array((x1, y1, z1), dtype=np.int32)
-    n11 = n10 + direction[dir1]
+    # Find nodes in cells (as tuples of ints; too small to benefit from arrays)
+    n00 = (int(x0), int(y0), int(z0))
+    n01 = _step_node(n00, dir0)
+    n10 = (int(x1), int(y1), int(z1))
+    n11 = _step_node(n10, dir1)
 
     # Identify terminating node as node not shared with second cell
-    term_node = None
     for test_node, other_node in zip((n00, n01), (n01, n00)):
-        if np.all(test_node == n10) or np.all(test_node == n11):
-            term_node = other_node
-            break
+        if test_node == n10 or test_node == n11:
+            return np.array(other_node, dtype=np.int32)
+
+    print('!!! Could not find terminating node.')
+    return None
+
+
+def _step_node(node, direction):
+    """Returns the node one cell from node along direction ('X' | 'Y' | 'Z')."""
 
-    if term_node is None:
-        print('!!! Could not find terminating node.')
+    dx, dy, dz = _directions[direction]
+    return (node[0] + dx, node[1] + dy, node[2] + dz)
 
-    return term_node
+
+def _same_node(node0, node1):
+    """Checks whether two mesh nodes (arrays or tuples, possibly None) are equal."""
+
+    if node0 is None or node1 is None:
+        return False
+
+    return tuple(node0) == tuple(node1)
 
 
 def find_segment_endpoints(segment, emin):
     """Finds start/end meshes indices of an MHARNESS segment."""
 
     # Get start/end node and handle one-cell segments
-    i_start = emin.find(segment, exact=True, separator='') + 1
-    i_end = emin.find_next(i_start, '', exact=True) - 1
+    segments = index_segments(emin)
+
+    if segment in segments:
+        i_start, i_end = segments[segment]
+        i_end -= 1
+
+    else:
+        i_start = emin.find(segment, exact=True, separator='') + 1
+        i_end = emin.find_next(i_start, '', exact=True) - 1
 
     if i_start == i_end:
         x0, y0, z0, dir0, _ = emin.get(i_start).split()
         start_node = np.array([x0, y0, z0], dtype=np.int32)
-        direction = {'X': np.array([1,0,0]), 'Y': np.array([0,1,0]), 'Z': np.array([0,0,1])}
-        end_node = start_node + direction[dir0]
+        end_node = start_node + _directions[dir0]
 
     else:
         # Get first and second cells in segment and find start node
@@ -318,10 +400,10 @@ def segment_connects_at_start_node(segment, neighbor, emin):
     #print('Segment start/end:', segment_start, segment_end)
     #print('Neighbor start/end:', neighbor_start, neighbor_end)
 
-    if np.all(segment_start == neighbor_start) or np.all(segment_start == neighbor_end):
+    if _same_node(segment_start, neighbor_start) or _same_node(segment_start, neighbor_end):
         return True
 
-    elif np.all(segment_end == neighbor_start) or np.all(segment_end == neighbor_end):
+    elif _same_node(segment_end, neighbor_start) or _same_node(segment_end, neighbor_end):
         return False
 
     else:
@@ -342,9 +424,10 @@ def find_limb_midpoint(limb, emin, verbose=False):
     i_mid = find_array_midpoint(cell_counts)
     segment = limb[i_mid]
 
-    # Find mesh index of midpoint on segment
-    n_before = sum(cell_counts[:i_mid])
-    n_mid = sum(cell_counts) // 2
+    # Find mesh index of midpoint on segment from running totals of cell counts
+    totals = np.cumsum(cell_counts)
+    n_before = int(totals[i_mid]) - cell_counts[i_mid]
+    n_mid = int(totals[-1]) // 2
     
     if i_mid >= 1:
         segment_before = limb[i_mid - 1]
@@ -353,7 +436,7 @@ def find_limb_midpoint(limb, emin, verbose=False):
             if verbose:
                 print(f'Segment {segment} connects to {segment_before} at start point--normal behavior.')
         else:
-            n_after = sum(cell_counts[:i_mid + 1])
+            n_after = int(totals[i_mid])
             index = n_after - n_mid + 1
             if verbose:
                 print(f'Segment {segment} connects to {segment_before} at end point--reverse behavior.')
@@ -366,11 +449,9 @@ def find_limb_midpoint(limb, emin, verbose=False):
 def probe_conductor_currents(conductor, inp, emin, verbose=False, timestep=None, endtime=None):
     """Places a current probe at the midpoint of each unbranching section of a conductor."""
     
-    # Create a graph mapping each segment to all connected segments
-    graph = create_graph(inp, conductor)
-
-    # Create "limbs", or chains of continuously connected, unbranching segments
-    limbs = create_limbs(inp, conductor, verbose)
+    # Create a graph mapping each segment to all connected segments, and "limbs",
+    # or chains of continuously connected, unbranching segments
+    graph, limbs = build_graph_and_limbs(inp, conductor, verbose)
 
     # Arrange limb segments in order of physical connectivity
     limbs = [order_limb(limb, graph, verbose) for limb in limbs]
@@ -378,14 +459,17 @@ def probe_conductor_currents(conductor, inp, emin, verbose=False, timestep=None,
     # Find midpoint mesh node for each limb
     midpoints = [find_limb_midpoint(limb, emin, verbose) for limb in limbs]
     
-    # Place probes at limb midpoints
+    # Place probes at limb midpoints (inserted into the inp file in one batch)
     if verbose:
         print('')
+    probes = []
     for segment, index in midpoints:
         segment = restore_segment_topology(segment, conductor, inp)
-        inp.probe_current(segment, conductor, index, timestep=timestep, end=endtime)
+        probes.append((segment, conductor, index))
         if verbose:
             print(f'Conductor {conductor}: added current probe to segment {segment} at index {index}.')
+
+    inp.probe_batch('current', probes, timestep=timestep, end=endtime)
     
     # Check input file
     if verbose:
@@ -416,10 +500,15 @@ def restore_segment_topology(segment, conductor, inp):
     indices = inp.find_all(segment, i_start, i_stop, exact=True, separator=('_', ' '))
     #print(f'found {len(indices)} occurrences of segment {segment}.')
 
+    # Search for the conductor once and check each segment definition for a match within it
+    hits = inp.find_all(conductor)
+
     for i0 in indices:
         i1 = inp.find_next(i0, '', exact=True)
+        if i1 is None:
+            i1 = len(inp.lines)
 
-        if inp.find(conductor, start=i0+1, end=i1):
+        if np.searchsorted(hits, i0 + 1) < np.searchsorted(hits, i1):
             print(f'found conductor {conductor}')
             segment = inp.get(i0).split()[0]
             break
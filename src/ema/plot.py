@@ -2,12 +2,16 @@
 
 import os
 import numpy as np
-import matplotlib.pyplot as plt
-try:
-	import seaborn as sns
-	sns.set()
-except:
-	pass
+
+
+def _set_style():
+	"""Applies seaborn styling if available; imported on first plot rather than with the package."""
+	try:
+		import seaborn as sns
+		sns.set()
+	except ImportError:
+		pass
+
 
 def simple_plot(path=None):
 	"""Plot simple_plot.dat results."""
@@ -24,8 +28,12 @@ def simple_plot(path=None):
 	if not os.path.isfile(path):
 		raise ValueError(f'Could not find file {path}')
 
+	# Import pyplot on first use so that importing the package does not load matplotlib
+	import matplotlib.pyplot as plt
+
 	# Load data and plot
 	t, vmin, vmax, vmean = np.loadtxt(path).T
+	_set_style()
 	plt.plot(t, vmean, label='Mean')
 	plt.fill_between(t, vmin, vmax, alpha=0.4, label='Range')
 	plt.legend()
@@ -102,46 +102,58 @@ def load_distributed_probe(path_and_name, precision='single'):
     if not os.path.exists(path_and_name):
         raise Exception(f'File path specified by user does not exist. ({path_and_name})')
     
-    # Process probe data
-    with open(path_and_name, 'r') as file:
-        lines = file.readlines()
-
-    time, data, buffer = [], [], []
     # TODO: automate precision check   
     dtype = np.float32 if precision == 'single' else np.float64
-    #total_lines = len(lines)
-    
-    for i, line in enumerate(lines):
-        #if i % (int(total_lines / 100)) == 0:
-        #    print(f'{round(i / total_lines * 100)}% complete.')
-        
-        line_split = line.split()
-        
-        # Error for non-float values in file
-        try:
-            values = [dtype(val) for val in line_split]
-        except:
-            raise ValueError(f'Entry in line {i} cannot be cast to {dtype}: "{line_split}"')
-
-        # If new timestep, add to time array
-        if len(buffer) == 0:
-            time.append(values[0])
-            buffer += values[1:]
-        else:
-            buffer += values
-
-        # If end of timestep, reshape and append to data array; reset buffer
-        if len(values) != 9:
-            data.append(np.reshape(buffer, (-1, 3)).T)            
-            buffer = []
+
+    # Read entries of the first time step line by line to find the time step size,
+    # then split the remainder of the file in one pass
+    with open(path_and_name, 'r') as file:
+        entries = []
+        for line in file:
+            line_split = line.split()
+            entries += line_split
+            if len(line_split) != 9:
+                break
+
+        step_size = len(entries)
+        entries += file.read().split()
+
+    if step_size == 0:
+        return np.array([]), np.array([])
+
+    # Convert all entries at once, locating the offending line only if this fails
+    try:
+        values = np.array(entries, dtype=dtype)
+    except ValueError:
+        _raise_for_invalid_entry(path_and_name, dtype)
+        raise
+
+    # Each time step consists of the time followed by x, y, z values for every point
+    if values.size % step_size != 0:
+        raise ValueError(f'Number of entries in {path_and_name} ({values.size}) is not a multiple of the time step size ({step_size}).')
+
+    values = values.reshape(-1, step_size)
+    time = values[:, 0].copy()
+    data = values[:, 1:].reshape(values.shape[0], -1, 3)
 
     # Swap axes to have shape [sample, component, time]
-    data = np.swapaxes(np.array(data), 0, -1)
-    time = np.array(time)
+    data = np.transpose(data, (1, 2, 0))
 
     return time, data
 
 
+def _raise_for_invalid_entry(path_and_name, dtype):
+    """Raises a ValueError identifying the first line of a file with an entry that cannot be cast to dtype."""
+
+    with open(path_and_name, 'r') as file:
+        for i, line in enumerate(file):
+            line_split = line.split()
+            try:
+                [dtype(val) for val in line_split]
+            except:
+                raise ValueError(f'Entry in line {i} cannot be cast to {dtype}: "{line_split}"')
+
+
 def load_distributed_probes(*args, precision='single'):
     """Loads multiple distributed or box probe results into a numpy array.
     
@@ -207,7 +219,7 @@ def convert_distributed_probe(path_and_name, fname=None, precision='single'):
         # TODO: make hardcoded slice more flexible?
         save_path_and_name = path_and_name[:-4] + '_' + str(time.time()) + '.dat'
     else:
-        save_path_and_name = '\\'.join(path_and_name.split('\\')[-1] + [fname])
+        save_path_and_name = os.path.join(os.path.dirname(path_and_name), fname)
         
     fmt = '%.7E' if precision == 'single' else '%.15E'
     np.savetxt(save_path_and_name, combined, fmt=fmt)
@@ -238,23 +250,14 @@ def load_charge_results(path_and_name):
     i1 = file.find_next(i0, '', exact=True)
     n = i1 - i0 - 1
 
-    # Unpack data
-    t, data = [], []
-    file.insert(len(file.lines), '') #helps with isolating time steps
-
-    for i in timestep_indices:
-        t.append(float(file.get(i).split()[-1]))
-
-        i0 = i + 4
-        i1 = i0 + n - 1
-    
-        lines = file.get(i0, i1)
-        d = np.array([line.split() for line in lines], dtype=float)
-        data.append(d)
+    # Unpack data, gathering the node rows of all time steps and converting them at once
+    lines = file.lines
+    t = np.array([float(lines[i].split()[-1]) for i in timestep_indices])
+    entries = ' '.join([line for i in timestep_indices for line in lines[i + 4:i + 4 + n]]).split()
+    data = np.array(entries, dtype=float).reshape(len(timestep_indices), n, -1)
 
     # Restructure to shape (fields, nodes, timesteps)
-    data = np.swapaxes(np.array(data), 0, -1)
-    t = np.array(t)
+    data = np.swapaxes(data, 0, -1)
 
     # Get field names and map to data with dict
     names = file.get(file.find('Node ')).split()
@@ -5,6 +5,7 @@ import glob
 
 import numpy as np
 import scipy
+import scipy.fft
 
 
 windows = {'hann': np.hanning,
@@ -13,8 +14,11 @@ windows = {'hann': np.hanning,
            'blackman': np.blackman,
            'kaiser': np.kaiser}
 
+precisions = {'single': np.float32,
+              'double': np.float64}
 
-def rfft(t, x, axis=-1, window=None):
+
+def rfft(t, x, axis=-1, window=None, precision=None):
     """Calculates FFT from real time series data.
     
     The result is normalized such that the FFT provides the true amplitude of each frequency.
@@ -32,12 +36,26 @@ def rfft(t, x, axis=-1, window=None):
         Axis along which to take FFT
     window : string (optional)
         Name of window function
+    precision : str (optional)
+        Precision of FFT ('single' | 'double'); defaults to precision of x.
+        Single precision is roughly twice as fast and sufficient for most shielding plots.
 
     Returns
     -------
     tuple
         A tuple of ndarrays of the form (frequency, FFT)
     """
+
+    f, x_fft = _rfft(t, x, axis, window, precision)
+
+    # Double the one-sided spectrum to obtain true amplitudes
+    x_fft *= 2
+
+    return f, x_fft
+
+
+def _rfft(t, x, axis=-1, window=None, precision=None):
+    """Implementation of rfft without amplitude scaling, for callers where the scaling cancels out."""
     
     # Handle errors and warnings
     if t.ndim > 1:
@@ -45,24 +63,36 @@ def rfft(t, x, axis=-1, window=None):
         
     elif t.size != x.shape[axis]:
         raise ValueError(f'Dimension of x axis {axis} ({x.shape[axis]}) must match size of t ({t.size}).')
+
+    elif precision is not None and precision not in precisions:
+        raise ValueError(f'Precision must be "single" or "double"; "{precision}" provided.')
         
-    elif np.any(np.iscomplexobj(x)):
+    elif np.iscomplexobj(x):
         warnings.warn(f'Array x has complex dtype {x.dtype}; imaginary components will be discarded, which may affect results.')
+        x = x.real
 
     # Apply window function
     if window is not None:
         if window.lower() in windows:
             window_func = windows[window.lower()]
             window_array = window_func(x.shape[axis], beta=14) if window.lower() == 'kaiser' else window_func(x.shape[axis])
-            x = np.swapaxes(np.swapaxes(x, -1, axis) * window_array, -1, axis)
+
+            # Shape window to broadcast along the FFT axis of x
+            shape = [1] * x.ndim
+            shape[axis] = window_array.size
+            x = x * window_array.reshape(shape)
 
         else:
             warnings.warn(f'Provided invalid window type "{window}"; window will default to rectangular.')
         
+    # Cast to requested precision
+    if precision is not None:
+        x = np.asarray(x, dtype=precisions[precision])
+
     # Compute FFT and frequency array
     # TODO: warning for non-uniform timesteps
     f = np.fft.rfftfreq(t.size) / (t[1] - t[0])
-    x_fft = np.fft.rfft(x, norm='forward', axis=axis) * 2
+    x_fft = scipy.fft.rfft(x, norm='forward', axis=axis, workers=-1)
         
     return f, x_fft
 
@@ -144,11 +174,10 @@ def pad(x, size, val=0):
         warnings.warn(f'Argument "size" ({size}) must be greater than x.shape[-1] ({x.shape[-1]}); returning original array.')
         return x
 
-    # Create padded array
-    pad_shape = list(x.shape)
-    pad_shape[-1] = size - x.shape[-1]
-    padding = val * np.ones(pad_shape)
-    x_new = np.concatenate([x, padding], axis=-1)
+    # Create padded array filled with val and copy x into the start
+    dtype = np.result_type(x.dtype, np.float64, val)
+    x_new = np.full(x.shape[:-1] + (size,), val, dtype=dtype)
+    x_new[..., :x.shape[-1]] = x
     
     return x_new
 
@@ -209,7 +238,7 @@ def resample(t, x, steps, mode='linear'):
     
     # Discriminate constant timestep from array of timesteps
     if np.iterable(steps):
-        t_resamp = steps
+        t_resamp = np.asarray(steps)
     
     else:
         dt = steps
@@ -217,15 +246,33 @@ def resample(t, x, steps, mode='linear'):
     
     # Resample each array in x
     x_flat = x.reshape(-1, x.shape[-1])
-    x_resamp = []
 
-    for array in x_flat:
-        if mode == 'linear':
-            x_resamp.append(np.interp(t_resamp, t, array))
-        
-        elif mode == 'spline':
-            bspline = scipy.interpolate.make_interp_spline(t, array, k=3)
-            x_resamp.append(bspline(t_resamp))
+    if mode == 'linear':
+        # Locate new samples between original samples once and blend all arrays at once
+        k = np.clip(np.searchsorted(t, t_resamp, side='right') - 1, 0, max(t.size - 2, 0))
+        k_upper = np.minimum(k + 1, t.size - 1)
+
+        # Zero-width intervals (repeated or single time steps) take the nearer sample, as np.interp does
+        dt = t[k_upper] - t[k]
+        w = (t_resamp >= t[k_upper]).astype(float)
+        np.divide(t_resamp - t[k], dt, out=w, where=dt > 0)
+        np.clip(w, 0, 1, out=w)
+
+        # Blend in place on the gathered samples to avoid full-size temporaries
+        dtype = np.result_type(x_flat, w)
+        x_resamp = x_flat[:, k].astype(dtype, copy=False)
+        x_resamp *= 1 - w
+        x_upper = x_flat[:, k_upper].astype(dtype, copy=False)
+        x_upper *= w
+        x_resamp += x_upper
+
+    elif mode == 'spline':
+        # Fit and evaluate splines for all arrays at once along the time axis
+        bspline = scipy.interpolate.make_interp_spline(t, x_flat, k=3, axis=-1)
+        x_resamp = bspline(t_resamp)
+
+    else:
+        raise ValueError(f'Interpolation mode must be "linear" or "spline"; "{mode}" provided.')
 
     # Shape resampled data to match original dimensions
     new_shape = list(x.shape)
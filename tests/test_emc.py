@@ -0,0 +1,12 @@
+import numpy as np
+
+import ema
+
+
+def test_shielding_integer_input():
+    xf = np.array([[1, 10], [2, 5]])
+    xf_ref = np.array([10, 100])
+
+    se = ema.shielding(xf, xf_ref)
+
+    np.testing.assert_allclose(se, 20 * np.log10(np.abs(xf_ref / xf)))
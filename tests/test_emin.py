@@ -0,0 +1,32 @@
+import ema
+
+
+def make_emin(tmp_path, points):
+    lines = ['!CURRENT DENSITY SOURCE', '!!header 1', '!!header 2', '!!header 3', *points, '', '!END']
+    path = tmp_path / 'test.emin'
+    path.write_text('\n'.join(lines) + '\n')
+    return ema.Emin(str(path))
+
+
+def test_restrict_surface_current_keeps_last_element(tmp_path):
+    points = [
+        '1 1 1 1.0 0.0 0.0',
+        '1 2 1 0.0 1.0 0.0',
+        '2 1 1 1.0 1.0 0.0',
+        '2 2 1 1.0 0.0 0.0',
+    ]
+    emin = make_emin(tmp_path, points)
+
+    emin.restrict_surface_current('x')
+    assert emin.lines[4:] == [points[0], points[2], points[3], '', '!END']
+
+
+def test_restrict_surface_current_removes_last_element(tmp_path):
+    points = [
+        '1 1 1 0.0 1.0 0.0',
+        '1 2 1 1.0 0.0 0.0',
+    ]
+    emin = make_emin(tmp_path, points)
+
+    emin.restrict_surface_current(1)
+    assert emin.lines[4:] == [points[0], '', '!END']
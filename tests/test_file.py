@@ -0,0 +1,151 @@
+import pytest
+
+import ema
+
+
+def make_file(tmp_path, lines):
+    path = tmp_path / 'test.inp'
+    path.write_text(''.join(line + '\n' for line in lines))
+    return ema.File(str(path))
+
+
+def test_find_next_loop(tmp_path):
+    n = 300
+    file = make_file(tmp_path, ['probe', 'other'] * n)
+
+    i = file.find('probe')
+    found = [i]
+    while True:
+        i = file.find_next(i, 'probe')
+        if i is None:
+            break
+        found.append(i)
+
+    assert found == list(range(0, 2 * n, 2))
+
+
+def test_find_all_repeated_after_many_queries(tmp_path):
+    file = make_file(tmp_path, [f'line {k}' for k in range(300)])
+
+    for k in range(300):
+        assert file.find_all(f'line {k}', exact=True).tolist() == [k]
+
+    assert file.find_all('line 0', exact=True).tolist() == [0]
+
+
+def test_find_all_result_is_a_copy(tmp_path):
+    file = make_file(tmp_path, ['a', 'b', 'a'])
+
+    indices = file.find_all('a')
+    indices[0] = 99
+
+    assert file.find_all('a').tolist() == [0, 2]
+
+
+def test_find_all_after_edit(tmp_path):
+    file = make_file(tmp_path, ['a', 'b', 'a'])
+
+    assert file.find_all('a').tolist() == [0, 2]
+
+    file.insert(1, 'a')
+    assert file.find_all('a').tolist() == [0, 1, 3]
+
+    file.lines[0] = 'b'
+    assert file.find_all('a').tolist() == [1, 3]
+
+
+def test_find_all_case_insensitive(tmp_path):
+    file = make_file(tmp_path, ['!HEADER', 'Probe A', 'probe b'])
+
+    assert file.find_all('probe').tolist() == [2]
+    assert file.find_all('PROBE', case=False).tolist() == [1, 2]
+    assert file.find_all('probe a', exact=True, case=False).tolist() == [1]
+
+
+def test_printlines_range(tmp_path, capsys):
+    file = make_file(tmp_path, ['first', 'second', 'third'])
+
+    file.printlines(2, 3)
+    assert capsys.readouterr().out == '2 \t| second\n3 \t| third\n'
+
+    file.printlines(1, 2, numbered=False)
+    assert capsys.readouterr().out == 'first\nsecond\n'
+
+    file.printlines(3)
+    assert capsys.readouterr().out == '3 \t| third\n'
+
+
+def test_edit_and_find_next_loop_does_not_rebuild_index(tmp_path, monkeypatch):
+    n = 200
+    file = make_file(tmp_path, ['!MARK', 'data'] * n)
+
+    # Count full rebuilds of the search index
+    builds = []
+    line_offsets = ema.File._line_offsets
+    monkeypatch.setattr(ema.File, '_line_offsets', staticmethod(lambda lines: builds.append(1) or line_offsets(lines)))
+
+    i = file.find('!MARK', exact=True)
+    found = [i]
+    while True:
+        file.lines[i + 1] = 'edited'
+        i = file.find_next(i, '!MARK', exact=True)
+        if i is None:
+            break
+        found.append(i)
+
+    assert found == list(range(0, 2 * n, 2))
+    assert len(builds) == 0
+
+    # Once edits stop, repeated searches build the index once and reuse it
+    assert file.find_all('edited').size == n
+    assert file.find_all('data').size == 0
+    assert file.find_all('!MARK', exact=True).size == n
+
+    assert len(builds) == 1
+
+
+def test_replace(tmp_path):
+    file = make_file(tmp_path, ['a', 'b', 'c', 'd'])
+
+    file.replace(1, 'x')
+    assert file.lines == ['a', 'x', 'c', 'd']
+
+    file.replace((1, 2), ['y'])
+    assert file.lines == ['a', 'y', 'd']
+
+    file.replace(-1, ['z', 'w'])
+    assert file.lines == ['a', 'y', 'z', 'w']
+
+    file.replace((-2, -1), 'v')
+    assert file.lines == ['a', 'y', 'v']
+
+
+def test_replace_invalid_index(tmp_path):
+    file = make_file(tmp_path, ['a', 'b'])
+
+    with pytest.raises(TypeError):
+        file.replace(1.5, 'x')
+
+
+def test_insert_multiple_indices(tmp_path):
+    file = make_file(tmp_path, ['a', 'b', 'c'])
+
+    file.insert([1, 2], ['x', 'y'])
+    assert file.lines == ['a', 'x', 'y', 'b', 'x', 'y', 'c']
+
+
+def test_insert_multiple_indices_past_end(tmp_path):
+    file = make_file(tmp_path, ['a', 'b'])
+
+    file.insert([1, 10], ['x', 'y'])
+    assert file.lines == ['a', 'x', 'y', 'b', 'x', 'y']
+
+
+def test_printlines_list(tmp_path, capsys):
+    file = make_file(tmp_path, ['first', 'second', 'third'])
+
+    file.printlines([1, 3])
+    assert capsys.readouterr().out == '1 \t| first\n3 \t| third\n'
+
+    file.printlines([1, 3], numbered=False)
+    assert capsys.readouterr().out == 'first\nthird\n'
@@ -0,0 +1,43 @@
+import ema
+
+
+def make_inp(tmp_path, lines):
+    path = tmp_path / 'test.inp'
+    path.write_text('\n'.join(['!TIME STEP', '!!NOTCOMPUTE', '1e-12 1000', '', *lines]) + '\n')
+    return ema.Inp(str(path))
+
+
+TERMINATIONS = [
+    '!BOUNDARY CONDITION', '!!RESISTIVE',
+    'SEG1 C1 0 50.0',
+    'SEG1 C1___S0 0 50.0',
+    'SEG2 C2 1 50.0',
+    '',
+    '!BOUNDARY CONDITION', '!!RESISTIVE',
+    'SEG3 C1 0 50.0',
+]
+
+
+def test_set_terminations(tmp_path):
+    inp = make_inp(tmp_path, TERMINATIONS)
+
+    inp.set_terminations(res_cond=1.0, res_shield=2.0)
+
+    assert inp.lines[-9:] == [
+        '!BOUNDARY CONDITION', '!!RESISTIVE',
+        'SEG1\tC1\t0\t1.0',
+        'SEG1\tC1___S0\t0\t2.0',
+        'SEG2\tC2\t1\t1.0',
+        '',
+        '!BOUNDARY CONDITION', '!!RESISTIVE',
+        'SEG3\tC1\t0\t1.0',
+    ]
+
+
+def test_set_terminations_by_segment(tmp_path):
+    inp = make_inp(tmp_path, TERMINATIONS)
+
+    inp.set_terminations_by_segment(['SEG1', 'SEG3'], 5)
+
+    assert inp.lines[-7:-4] == ['SEG1        C1        0        5', 'SEG1 C1___S0 0 50.0', 'SEG2 C2 1 50.0']
+    assert inp.lines[-1] == 'SEG3        C1        0        5'
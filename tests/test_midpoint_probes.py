@@ -0,0 +1,28 @@
+from ema import midpoint_probes
+
+
+def test_add_limb_new():
+    limbs = [[1, 2]]
+
+    limbs = midpoint_probes.add_limb([3, 4], limbs)
+
+    assert limbs == [[1, 2], [3, 4]]
+
+
+def test_add_limb_merges_once_per_limb():
+    # Two new segments already belong to the same limb
+    limbs = [[1, 2], [3, 4], [5]]
+
+    limbs = midpoint_probes.add_limb([1, 2, 9], limbs)
+
+    assert limbs[:2] == [[3, 4], [5]]
+    assert sorted(limbs[2]) == [1, 2, 9]
+
+
+def test_add_limb_joins_limbs():
+    limbs = [[1, 2], [3, 4], [5]]
+
+    limbs = midpoint_probes.add_limb([2, 3], limbs)
+
+    assert limbs[0] == [5]
+    assert sorted(limbs[1]) == [1, 2, 3, 4]
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import ema
+
+
+def write_distributed_probe(path, t, data):
+    """Writes data with shape [sample, component, time] in the nine-entries-per-line probe format."""
+
+    lines = []
+    for n, step in enumerate(t):
+        entries = [step, *data[:, :, n].ravel()]
+        for i in range(0, len(entries), 9):
+            lines.append(' '.join(f'{value:.7E}' for value in entries[i:i + 9]))
+
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_load_distributed_probe_shape(tmp_path):
+    t = np.array([0.0, 1e-9, 2e-9])
+    data = np.arange(4 * 3 * t.size, dtype=float).reshape(4, 3, t.size)
+    path = tmp_path / 'probe.dat'
+    write_distributed_probe(path, t, data)
+
+    t_loaded, data_loaded = ema.load_distributed_probe(str(path), precision='double')
+
+    np.testing.assert_allclose(t_loaded, t)
+    assert data_loaded.shape == (4, 3, t.size)
+    np.testing.assert_allclose(data_loaded, data)
+
+
+def test_load_distributed_probe_invalid_entry(tmp_path):
+    path = tmp_path / 'probe.dat'
+    path.write_text('0.0 1.0 2.0 3.0\n1.0 1.0 abc 3.0\n')
+
+    with pytest.raises(ValueError, match='line 1'):
+        ema.load_distributed_probe(str(path))
+
+
+def test_convert_distributed_probe_fname(tmp_path):
+    t = np.array([0.0, 1e-9])
+    data = np.arange(2 * 3 * t.size, dtype=float).reshape(2, 3, t.size)
+    path = tmp_path / 'probe.dat'
+    write_distributed_probe(path, t, data)
+
+    ema.convert_distributed_probe(str(path), fname='flat.dat', precision='double')
+
+    combined = np.loadtxt(tmp_path / 'flat.dat')
+    np.testing.assert_allclose(combined[:, 0], t)
+    np.testing.assert_allclose(combined[:, 1:], np.concatenate(data, axis=0).T)
+
+
+def test_load_charge_results(tmp_path):
+    t = np.array([0.0, 1e-9])
+    values = np.arange(t.size * 3 * 2, dtype=float).reshape(t.size, 3, 2)
+
+    lines = ['FEM results', '']
+    for step, block in zip(t, values):
+        lines += [f' Current time = {step:.6E}', '---', '', 'Node Ex Ey']
+        lines += [f'{node + 1} {row[0]:.6E} {row[1]:.6E}' for node, row in enumerate(block)]
+        lines += ['']
+    path = tmp_path / 'femCHARGE_results.dat'
+    path.write_text('\n'.join(lines[:-1]) + '\n')
+
+    t_loaded, fields = ema.load_charge_results(str(path))
+
+    np.testing.assert_allclose(t_loaded, t)
+    assert list(fields) == ['Node', 'Ex', 'Ey']
+    np.testing.assert_allclose(fields['Node'], [[1, 1], [2, 2], [3, 3]])
+    np.testing.assert_allclose(fields['Ex'], values[:, :, 0].T)
+    np.testing.assert_allclose(fields['Ey'], values[:, :, 1].T)
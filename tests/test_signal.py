@@ -0,0 +1,34 @@
+import numpy as np
+
+import ema
+
+
+def test_resample_linear_repeated_time_step():
+    t = np.array([0, 1, 2, 2], dtype=float)
+    x = np.array([0, 1, 2, 3], dtype=float)
+
+    _, x_resamp = ema.resample(t, x, [2.0])
+
+    np.testing.assert_array_equal(x_resamp, [3.0])
+
+
+def test_resample_linear_single_sample():
+    t = np.array([1.0])
+    x = np.array([5.0])
+
+    _, x_resamp = ema.resample(t, x, [0.0, 2.0])
+
+    np.testing.assert_array_equal(x_resamp, [5.0, 5.0])
+
+
+def test_resample_linear_matches_interp():
+    t = np.array([0, 1, 1, 2, 3, 3], dtype=float)
+    x = np.arange(2 * 3 * t.size).reshape(2, 3, t.size)
+    steps = np.array([-1, 0, 0.5, 1, 1.5, 3, 4])
+
+    for data in (x, x * (1 + 1j)):
+        _, x_resamp = ema.resample(t, data, steps)
+        expected = np.array([np.interp(steps, t, row) for row in data.reshape(-1, t.size)])
+
+        assert x_resamp.shape == (2, 3, steps.size)
+        np.testing.assert_allclose(x_resamp.reshape(-1, steps.size), expected)